@@ -1,32 +1,249 @@
-from functools import lru_cache
+from pathlib import Path
+from typing import List
+from langchain_core.embeddings import Embeddings
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from dotenv import load_dotenv
+from google.api_core import exceptions as google_exceptions
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+import hashlib
+import numpy as np
 import os
+import sqlite3
+import threading
 
 # Load environment variables
 load_dotenv()
 
-@lru_cache
+# SQLite caps the number of bound parameters per statement
+_SQLITE_MAX_PARAMS = 900
+
+# Process-wide embedding model, created on first use
+_embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+def quantize(vector: List[float]) -> bytes:
+    """Encode a vector as int8 codes with a per-vector float32 scale.
+    
+    Components are scaled so the largest magnitude maps to 127, which keeps
+    far more precision than a fixed scale while using a quarter of the
+    space of float32.
+    
+    Args:
+        vector: The embedding to encode
+        
+    Returns:
+        The 4-byte scale followed by one signed byte per component
+    """
+    v = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.abs(v).max()) if v.size else 0.0
+    scale = np.float32(max_abs / 127 if max_abs else 1.0)
+    codes = np.round(v / scale).astype(np.int8)
+    return scale.tobytes() + codes.tobytes()
+
+def dequantize(blob: bytes) -> np.ndarray:
+    """Decode a vector produced by quantize into a float32 array."""
+    scale = np.frombuffer(blob[:4], dtype=np.float32)[0]
+    codes = np.frombuffer(blob[4:], dtype=np.int8)
+    return codes.astype(np.float32) * scale
+
+# Upstream failures worth retrying: 5xx, 429 and network timeouts. Anything
+# else (bad API key, invalid request) fails at once.
+_TRANSIENT_ERRORS = (
+    google_exceptions.ServerError,
+    google_exceptions.TooManyRequests,
+    TimeoutError,
+    ConnectionError,
+)
+
+def _is_transient(error: BaseException) -> bool:
+    """Check an error and the errors it wraps for a transient failure.
+    
+    The Google model re-raises client errors wrapped in its own exception
+    type, so the cause chain is walked as well.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, _TRANSIENT_ERRORS):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+def embed_with_bisect(
+    model: Embeddings,
+    texts: List[str],
+    retries: int = 3,
+    **kwargs,
+) -> List[List[float]]:
+    """Embed texts, bisecting the batch when a request fails.
+    
+    A batch that fails with a transient error is split in half and each
+    half retried, down to single texts, so one bad request costs O(log N)
+    extra calls instead of re-embedding the whole batch. Single texts are
+    retried with exponential backoff before the error is raised. Permanent
+    errors are raised immediately.
+    
+    Args:
+        model: The upstream embedding model
+        texts: Texts to embed
+        retries: Attempts per single text before giving up
+        
+    Returns:
+        One embedding per text, in input order
+    """
+    if len(texts) <= 1:
+        embed = retry(
+            stop=stop_after_attempt(retries),
+            wait=wait_exponential(multiplier=0.5, max=8),
+            retry=retry_if_exception(_is_transient),
+            reraise=True,
+        )(model.embed_documents)
+        return embed(texts, **kwargs)
+    try:
+        return model.embed_documents(texts, **kwargs)
+    except Exception as e:
+        if not _is_transient(e):
+            raise
+        mid = len(texts) // 2
+        print(f"Embedding batch of {len(texts)} failed ({e}), retrying halves")
+        return (
+            embed_with_bisect(model, texts[:mid], retries, **kwargs)
+            + embed_with_bisect(model, texts[mid:], retries, **kwargs)
+        )
+
+class CachedEmbeddings(Embeddings):
+    """Embedding model wrapper that caches document vectors on disk.
+    
+    Vectors are keyed by the SHA-256 of the model name, task type and text,
+    so identical chunks are only ever sent to the upstream model once.
+    Cached vectors are stored int8-quantized. Query embeddings are passed
+    straight through.
+    """
+    
+    def __init__(self, model: Embeddings, cache_path: str | Path = ".embedding_cache.sqlite"):
+        """Initialize the cache.
+        
+        Args:
+            model: The upstream embedding model
+            cache_path: Path to the SQLite cache file
+        """
+        self.model = model
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_int8 (key BLOB PRIMARY KEY, vec BLOB)"
+        )
+        self._conn.commit()
+    
+    def _key(self, text: str, task_type: str | None) -> bytes:
+        model_name = getattr(self.model, "model", type(self.model).__name__)
+        return hashlib.sha256(f"{model_name}\0{task_type}\0{text}".encode()).digest()
+    
+    def _lookup(self, keys: List[bytes]) -> dict:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _SQLITE_MAX_PARAMS):
+                chunk = keys[start:start + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embeddings_int8 WHERE key IN ({placeholders})",
+                    chunk,
+                )
+                for key, vec in rows:
+                    found[key] = dequantize(vec)
+        return found
+    
+    def _store(self, entries: dict) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings_int8 (key, vec) VALUES (?, ?)",
+                [(key, quantize(vec)) for key, vec in entries.items()],
+            )
+            self._conn.commit()
+    
+    def embed_documents_array(self, texts: List[str], **kwargs) -> np.ndarray:
+        """Embed texts into a float32 array, calling upstream only for cache misses.
+        
+        Returns:
+            Array of shape (len(texts), dim), one row per text
+        """
+        keys = [self._key(text, kwargs.get("task_type")) for text in texts]
+        vectors = self._lookup(list(set(keys)))
+        
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        
+        if missing:
+            fresh = embed_with_bisect(self.model, list(missing.values()), **kwargs)
+            new_entries = dict(zip(missing.keys(), fresh))
+            self._store(new_entries)
+            # Serve the quantized values so hits and misses return the same vectors
+            vectors.update(
+                (key, dequantize(quantize(vec))) for key, vec in new_entries.items()
+            )
+        
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+    
+    def embed_documents(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed texts as lists, for callers expecting the LangChain interface."""
+        return self.embed_documents_array(texts, **kwargs).tolist()
+    
+    def embed_query(self, text: str, **kwargs) -> List[float]:
+        """Embed a query with the upstream model."""
+        return self.model.embed_query(text, **kwargs)
+    
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """Embed several queries in one upstream request, bypassing the cache.
+        
+        Queries are not written to the cache and are not quantized, so
+        they match what embed_query returns for the same text.
+        
+        Returns:
+            float32 array of shape (len(texts), dim), one row per query
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        vectors = self.model.embed_documents(texts, task_type="RETRIEVAL_QUERY")
+        return np.asarray(vectors, dtype=np.float32)
+
 def get_embedding_model():
-    """Get a cached instance of the Google Generative AI embedding model.
+    """Get the shared instance of the Google Generative AI embedding model.
+    
+    The instance is created once per process; the API app creates it at
+    startup so the first request does not pay the initialization cost.
+    The model is wrapped in a CachedEmbeddings so repeated chunks are served
+    from the on-disk cache at EMBEDDING_CACHE_PATH.
     
     Returns:
-        GoogleGenerativeAIEmbeddings: An instance of the embedding model.
+        CachedEmbeddings: An instance of the embedding model.
         
     Raises:
         ValueError: If GOOGLE_API_KEY is not set in environment variables.
     """
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "GOOGLE_API_KEY not found in environment variables. "
-            "Please set it in your .env file."
-        )
-    
-    return GoogleGenerativeAIEmbeddings(
-        model="models/embedding-001",
-        google_api_key=api_key,
-    )
+    global _embedding_model
+    with _embedding_model_lock:
+        if _embedding_model is None:
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError(
+                    "GOOGLE_API_KEY not found in environment variables. "
+                    "Please set it in your .env file."
+                )
+            
+            model = GoogleGenerativeAIEmbeddings(
+                model="models/embedding-001",
+                google_api_key=api_key,
+            )
+            _embedding_model = CachedEmbeddings(
+                model,
+                cache_path=os.getenv("EMBEDDING_CACHE_PATH", ".embedding_cache.sqlite"),
+            )
+    return _embedding_model
 
 if __name__ == "__main__":
     print("Embedding Model Demonstration")
@@ -1,16 +1,41 @@
+from bisect import bisect_right
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+import mmap
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Tuple
+import numpy as np
 from langchain_community.document_loaders import (
-    TextLoader, PyPDFLoader, CSVLoader, DirectoryLoader, UnstructuredExcelLoader
+    PyPDFLoader, CSVLoader, UnstructuredExcelLoader, UnstructuredFileLoader
 )
 from langchain.schema import Document
 
-def load_any(path: str | Path) -> List[Document]:
-    """Dispatch to the right LC loader based on suffix / folder."""
-    p = Path(path)
-    if p.is_dir():
-        return DirectoryLoader(str(p), glob="**/*.*", show_progress=True).load()
+# Suffixes _load_file parses itself; in a directory, any other file goes to
+# Unstructured, as it did with DirectoryLoader
+_PARSED_SUFFIXES = {".pdf", ".csv", ".xlsx", ".xls"}
+_TEXT_SUFFIXES = {".txt", ".text", ".md", ".markdown", ".rst", ".log"}
+
+def _load_text(p: Path) -> List[Document]:
+    """Load a UTF-8 text file as a single Document.
+
+    The file is memory-mapped and decoded straight from the mapping, so the
+    raw bytes are never copied into an intermediate Python buffer.
+    """
+    with open(p, "rb") as f:
+        if f.seek(0, 2) == 0:
+            text = ""
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, "utf-8")
+    # Match text-mode reads, which translate Windows/old Mac line endings
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return [Document(page_content=text, metadata={"source": str(p)})]
 
+def _load_file(p: Path) -> List[Document]:
+    """Load a single file with the LC loader matching its suffix."""
     match p.suffix.lower():
         case ".pdf":
             return PyPDFLoader(str(p)).load_and_split()
@@ -20,15 +45,256 @@ def load_any(path: str | Path) -> List[Document]:
         case ".xlsx" | ".xls":
             return UnstructuredExcelLoader(str(p)).load()
         case _:
-            return TextLoader(str(p)).load()
-        
+            return _load_text(p)
+
+def _load_directory_file(p: Path) -> List[Document]:
+    """Load a file found under a directory, using Unstructured for unknown types."""
+    suffix = p.suffix.lower()
+    if suffix in _PARSED_SUFFIXES or suffix in _TEXT_SUFFIXES:
+        return _load_file(p)
+    return UnstructuredFileLoader(str(p)).load()
+
+def _load_in_threads(paths: List[Path]) -> dict:
+    """Load files in a thread pool, returning their Documents keyed by path."""
+    with ThreadPoolExecutor() as threads:
+        futures = {p: threads.submit(_load_directory_file, p) for p in paths}
+        return {p: future.result() for p, future in futures.items()}
+
+def _load_directory(directory: Path) -> List[Document]:
+    """Load every file under a directory, parsing files in parallel.
+
+    Hidden files and anything under a hidden directory (.git, .DS_Store)
+    are skipped. PDF parsing is CPU-bound, so PDFs go to a process pool;
+    the other formats are mostly I/O and go to a thread pool. Documents are
+    returned in path order regardless of which file finishes first.
+    """
+    paths = sorted(
+        p for p in directory.rglob("*.*")
+        if p.is_file()
+        and not any(part.startswith(".") for part in p.relative_to(directory).parts)
+    )
+    pdfs = [p for p in paths if p.suffix.lower() == ".pdf"]
+    others = [p for p in paths if p.suffix.lower() != ".pdf"]
+
+    loaded = {}
+    if len(pdfs) > 1:
+        # Submitting forks the PDF workers, so do it before any loader thread
+        # exists; a child forked mid-load could inherit a held lock and hang
+        with ProcessPoolExecutor() as processes:
+            pdf_futures = {p: processes.submit(_load_file, p) for p in pdfs}
+            loaded.update(_load_in_threads(others))
+            loaded.update((p, future.result()) for p, future in pdf_futures.items())
+    else:
+        loaded.update((p, _load_file(p)) for p in pdfs)
+        loaded.update(_load_in_threads(others))
+
+    return list(chain.from_iterable(loaded[p] for p in paths))
+
+def load_any(path: str | Path) -> List[Document]:
+    """Dispatch to the right LC loader based on suffix / folder."""
+    p = Path(path)
+    if p.is_dir():
+        return _load_directory(p)
+    return _load_file(p)
+
+def _boundary_levels(text: str) -> List[np.ndarray]:
+    """Find candidate split offsets, coarsest first: paragraphs, lines, words.
+
+    Offsets index characters (UTF-32 gives one array element per code point)
+    and point at the separator, so a cut at offset p yields text[:p], text[p:].
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    newline = codes == ord("\n")
+    paragraphs = np.flatnonzero(newline[:-1] & newline[1:])
+    lines = np.flatnonzero(newline)
+    words = np.flatnonzero((codes == ord(" ")) | (codes == ord("\t")))
+    return [paragraphs, lines, words]
+
+def _word_starts(text: str) -> np.ndarray:
+    """Find the offset of every whitespace-delimited token in text."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    space = (codes == ord(" ")) | (codes == ord("\n")) | (codes == ord("\t"))
+    follows_space = np.concatenate(([True], space[:-1]))
+    return np.flatnonzero(~space & follows_space)
+
+def _check_chunk_sizes(chunk_size: int, overlap: int) -> None:
+    """Reject chunk sizes the splitter cannot honour."""
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if overlap < 0:
+        raise ValueError(f"overlap must not be negative, got {overlap}")
+    if overlap >= chunk_size:
+        raise ValueError(
+            f"overlap ({overlap}) must be smaller than chunk_size ({chunk_size})"
+        )
+
+def _chunk_spans(
+    text: str,
+    chunk_size: int,
+    measure: Callable[[int, int], int] | None = None,
+) -> List[Tuple[int, int]]:
+    """Pack text greedily into spans of at most chunk_size units.
+
+    An oversized span is cut at the coarsest separator level that has a
+    boundary inside it, each piece running to the last boundary that still
+    fits. A stretch with no fitting boundary at that level is packed at the
+    next finer level, and hard-cut once no level has a boundary left.
+    Adjacent spans that fit together are then merged so headings don't end
+    up as tiny chunks. measure(lo, hi) gives the size of text[lo:hi]; it
+    defaults to the number of characters.
+    """
+    if measure is None:
+        measure = lambda lo, hi: hi - lo
+    levels = _boundary_levels(text)
+    spans = []
+
+    def pack(lo: int, hi: int, depth: int) -> None:
+        if measure(lo, hi) <= chunk_size:
+            spans.append((lo, hi))
+            return
+        for level in range(depth, len(levels)):
+            start, stop = np.searchsorted(levels[level], [lo + 1, hi])
+            if start < stop:
+                cuts = levels[level][start:stop].tolist() + [hi]
+                break
+        else:
+            # No separator left: cut at the last character that fits, but
+            # always advance, since a single character can't be cut further
+            while lo < hi:
+                fits = bisect_right(range(lo + 1, hi + 1), chunk_size, key=lambda c: measure(lo, c))
+                cut = lo + max(fits, 1)
+                spans.append((lo, cut))
+                lo = cut
+            return
+
+        pos, i = lo, 0
+        while pos < hi:
+            # cuts[j - 1] is the furthest boundary that keeps pos..cut in budget
+            j = bisect_right(cuts, chunk_size, lo=i, key=lambda c: measure(pos, c))
+            if j > i:
+                spans.append((pos, cuts[j - 1]))
+                pos, i = cuts[j - 1], j
+            else:
+                pack(pos, cuts[i], level + 1)
+                pos, i = cuts[i], i + 1
+
+    pack(0, len(text), 0)
+    merged = [spans[0]]
+    for lo, hi in spans[1:]:
+        if measure(merged[-1][0], hi) <= chunk_size:
+            merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+def _overlap_start(text: str, start: int, overlap: int) -> int:
+    """Move a chunk start back by at most overlap characters, to a word start."""
+    pos = max(start - overlap, 0)
+    while pos < start and pos > 0 and not text[pos - 1].isspace():
+        pos += 1
+    return pos
+
+def fast_recursive_split(text: str, target_tokens: int = 200, overlap: int = 20) -> List[str]:
+    """Split text into chunks of at most target_tokens tokens.
+
+    Uses the same one-pass boundary scan and packing as split_docs, but
+    budgets chunks in whitespace-delimited tokens, located once with NumPy,
+    instead of characters. Every chunk after the first is prefixed with the
+    preceding overlap tokens, which count towards target_tokens.
+
+    Args:
+        text: Text to split
+        target_tokens: Maximum tokens per chunk, including the overlap
+        overlap: Tokens repeated from the end of the previous chunk
+
+    Returns:
+        Chunk texts in document order
+
+    Raises:
+        ValueError: If target_tokens < 1, overlap < 0 or overlap >= target_tokens
+    """
+    _check_chunk_sizes(target_tokens, overlap)
+    starts = _word_starts(text)
+
+    def tokens(lo: int, hi: int) -> int:
+        first, last = np.searchsorted(starts, [lo, hi])
+        return int(last - first)
+
+    chunks = []
+    for i, (lo, hi) in enumerate(_chunk_spans(text, target_tokens - overlap, tokens)):
+        if i and overlap:
+            first = int(np.searchsorted(starts, lo))
+            lo = int(starts[max(first - overlap, 0)])
+        content = text[lo:hi].strip()
+        if content:
+            chunks.append(content)
+    return chunks
+
+@dataclass(eq=False)
+class ChunkBatch(Sequence):
+    """Chunks stored column-wise, materialized as Documents only on access.
+
+    texts, offsets and doc_index hold one entry per chunk; metadatas holds
+    one dict per source document, shared by all of its chunks. offsets are
+    (start, end) character offsets such that source[start:end] == texts[i].
+    Indexing or iterating yields Documents, so a batch can be passed
+    anywhere a list of chunks is expected.
+    """
+    texts: np.ndarray
+    offsets: np.ndarray
+    doc_index: np.ndarray
+    metadatas: List[dict]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return Document(
+            page_content=self.texts[i],
+            metadata=dict(self.metadatas[self.doc_index[i]]),
+        )
+
+    def chunk_metadatas(self) -> List[dict]:
+        """Return the (shared) metadata dict of each chunk, in chunk order."""
+        return [self.metadatas[i] for i in self.doc_index]
+
+def split_docs(docs, chunk_size=300, overlap=20) -> ChunkBatch:
+    """Split documents into chunks of at most chunk_size characters.
+
+    Separator offsets are scanned once per document with NumPy and the text
+    is packed by offset, so chunks are produced by slicing rather than by
+    re-scanning the text. Every chunk after the first is prefixed with up
+    to overlap preceding characters, starting at a word, and no chunk is
+    longer than chunk_size.
+
+    Raises:
+        ValueError: If chunk_size < 1, overlap < 0 or overlap >= chunk_size
+    """
+    _check_chunk_sizes(chunk_size, overlap)
+    texts, offsets, doc_index, metadatas = [], [], [], []
+    for doc in docs:
+        text = doc.page_content
+        for i, (lo, hi) in enumerate(_chunk_spans(text, chunk_size - overlap)):
+            start = _overlap_start(text, lo, overlap) if i and overlap else lo
+            raw = text[start:hi]
+            content = raw.strip()
+            if content:
+                start += len(raw) - len(raw.lstrip())
+                texts.append(content)
+                offsets.append((start, start + len(content)))
+                doc_index.append(len(metadatas))
+        metadatas.append(doc.metadata)
 
-def split_docs(docs, chunk_size=300, overlap=20):
-    from langchain_text_splitters import RecursiveCharacterTextSplitter
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size, chunk_overlap=overlap, length_function=len
+    batch_texts = np.empty(len(texts), dtype=object)
+    batch_texts[:] = texts
+    return ChunkBatch(
+        texts=batch_texts,
+        offsets=np.array(offsets, dtype=np.int64).reshape(-1, 2),
+        doc_index=np.array(doc_index, dtype=np.int32),
+        metadatas=metadatas,
     )
-    return splitter.split_documents(docs)
 
 if __name__ == "__main__":
     # Quick demonstration of loader functionality
@@ -52,6 +318,6 @@ if __name__ == "__main__":
     
     # 3. Show chunk overlap
     if len(chunks) > 1:
-        overlap = set(chunks[0].page_content.split()) & set(chunks[1].page_content.split())
+        overlap = max(int(chunks.offsets[0, 1] - chunks.offsets[1, 0]), 0)
         print(f"\n3. Demonstrating overlap between chunks")
-        print(f"Found {len(overlap)} overlapping words between first two chunks")
+        print(f"Found {overlap} overlapping characters between first two chunks")
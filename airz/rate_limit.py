@@ -0,0 +1,68 @@
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions per `per` seconds.
+    
+    The bucket starts full, so bursts of up to `rate` are served
+    immediately; tokens then refill continuously.
+    """
+    
+    def __init__(self, rate: int, per: float = 60.0):
+        """Initialize the bucket.
+        
+        Args:
+            rate: Number of tokens available per period
+            per: Length of the period in seconds
+            
+        Raises:
+            ValueError: If rate is below 1 or per is not positive
+        """
+        if rate < 1:
+            raise ValueError(f"rate must be at least 1, got {rate}")
+        if per <= 0:
+            raise ValueError(f"per must be positive, got {per}")
+        self.capacity = float(rate)
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+    
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take tokens if available, without waiting.
+        
+        Returns:
+            True if the tokens were taken, False if the caller is over the limit
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+    
+    def acquire(self, tokens: int = 1) -> None:
+        """Take tokens, sleeping until they are available.
+        
+        The tokens are reserved straight away, letting the balance go
+        negative, and the caller sleeps only until its own reservation is
+        covered. Concurrent callers therefore wait in parallel rather than
+        queueing on the lock.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= tokens
+            wait = -self.tokens / self.fill_rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+    
+    def retry_after(self, tokens: int = 1) -> float:
+        """Seconds until `tokens` will be available."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self.tokens) / self.fill_rate)
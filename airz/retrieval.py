@@ -37,7 +37,9 @@ def format_docs(docs: list[Document]) -> str:
     Returns:
         A single string with all document contents, separated by double newlines
     """
-    return "\n\n".join(d.page_content for d in docs)
+    # A list lets str.join size the result in one pass; a generator would
+    # first be copied into a temporary sequence
+    return "\n\n".join([d.page_content for d in docs])
 
 
 if __name__ == "__main__":
@@ -1,21 +1,164 @@
+import asyncio
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Coroutine, Iterable, Iterator, List, Tuple
+import numpy as np
 from langchain_chroma import Chroma
 from langchain.schema import Document
 from airz.embeddings import get_embedding_model
-from airz.loaders import load_any, split_docs
+from airz.loaders import ChunkBatch, load_any, split_docs
+
+def _batched(items: Iterable, n: int) -> Iterator[list]:
+    """Yield successive lists of at most n items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _columns(docs: ChunkBatch | List[Document]) -> Tuple[List[str], List[dict], List[str]]:
+    """Return the texts, metadatas and ids of docs as parallel lists.
+
+    A ChunkBatch is read column-wise, so no Document objects are created.
+    """
+    if isinstance(docs, ChunkBatch):
+        ids = [str(uuid.uuid4()) for _ in range(len(docs))]
+        return list(docs.texts), docs.chunk_metadatas(), ids
+    return (
+        [doc.page_content for doc in docs],
+        [doc.metadata for doc in docs],
+        [doc.id or str(uuid.uuid4()) for doc in docs],
+    )
+
+def add_embedded_documents(
+    db: Chroma,
+    docs: ChunkBatch | List[Document],
+    vectors: np.ndarray,
+) -> List[str]:
+    """Insert documents whose embeddings have already been computed.
+    
+    Args:
+        db: The Chroma store to insert into
+        docs: Chunk batch or documents to insert
+        vectors: Array with one embedding row per document, in the same order
+        
+    Returns:
+        List of IDs of the inserted documents
+    """
+    texts, metadatas, ids = _columns(docs)
+    # Chroma rejects upserts larger than the client's maximum batch size
+    max_batch_size = db._client.get_max_batch_size()
+    # Chroma rejects empty metadata dicts, so upsert those rows without metadata
+    with_metadata = [i for i, metadata in enumerate(metadatas) if metadata]
+    without_metadata = [i for i, metadata in enumerate(metadatas) if not metadata]
+    for indices, has_metadata in ((with_metadata, True), (without_metadata, False)):
+        for batch in _batched(indices, max_batch_size):
+            db._collection.upsert(
+                ids=[ids[i] for i in batch],
+                embeddings=vectors[batch],
+                documents=[texts[i] for i in batch],
+                metadatas=[metadatas[i] for i in batch] if has_metadata else None,
+            )
+    return ids
+
+async def aembed_texts(
+    texts: List[str],
+    batch_size: int = 100,
+    concurrency: int = 8,
+) -> np.ndarray:
+    """Embed texts in batches, running up to `concurrency` requests at once.
+    
+    Duplicate texts (repeated headers, footers, boilerplate) are only sent
+    to the model once.
+    
+    Args:
+        texts: Texts to embed
+        batch_size: Number of texts sent per embedding request
+        concurrency: Maximum number of requests in flight
+        
+    Returns:
+        float32 array with one embedding row per text, in input order
+    """
+    model = get_embedding_model()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    # Embed each distinct text once, then fan vectors back out by position
+    unique = {}
+    order = [unique.setdefault(text, len(unique)) for text in texts]
+    
+    async def embed_batch(batch: List[str]) -> np.ndarray:
+        async with semaphore:
+            return await asyncio.to_thread(model.embed_documents_array, batch)
+    
+    results = await asyncio.gather(
+        *(embed_batch(batch) for batch in _batched(unique, batch_size))
+    )
+    if not results:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.concatenate(results)[order]
+
+async def aadd_documents(
+    db: Chroma,
+    docs: ChunkBatch | List[Document],
+    batch_size: int = 100,
+    concurrency: int = 8,
+) -> List[str]:
+    """Embed documents concurrently and add them to a Chroma store.
+    
+    Args:
+        db: The Chroma store to insert into
+        docs: Chunk batch or documents to embed and insert
+        batch_size: Number of documents sent per embedding request
+        concurrency: Maximum number of embedding requests in flight
+        
+    Returns:
+        List of IDs of the inserted documents
+    """
+    texts = list(docs.texts) if isinstance(docs, ChunkBatch) else [
+        doc.page_content for doc in docs
+    ]
+    vectors = await aembed_texts(
+        texts,
+        batch_size=batch_size,
+        concurrency=concurrency,
+    )
+    return await asyncio.to_thread(add_embedded_documents, db, docs, vectors)
+
+def _run_sync(coro: Coroutine) -> Any:
+    """Run a coroutine to completion from synchronous code.
+
+    asyncio.run refuses to start inside a running event loop (Jupyter, async
+    request handlers), so in that case the coroutine gets its own loop on a
+    worker thread and the caller blocks until it finishes.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 def build_chroma(
-    docs: Iterable[Document],
+    docs: ChunkBatch | Iterable[Document],
     persist_dir: str | Path = "./chroma_db",
     force_rebuild: bool = False,
+    batch_size: int = 100,
+    concurrency: int = 8,
 ) -> Chroma:
     """Build or load a Chroma vector store.
     
     Args:
-        docs: Documents to store in the database
+        docs: Chunk batch or documents to store in the database
         persist_dir: Directory to store the database
         force_rebuild: If True, rebuild the database even if it exists
+        batch_size: Number of chunks sent per embedding request
+        concurrency: Maximum number of embedding requests in flight
         
     Returns:
         Chroma: A vector store instance
@@ -31,18 +174,45 @@ def build_chroma(
     persist_dir.parent.mkdir(parents=True, exist_ok=True)
     
     print(f"Building new database in {persist_dir}")
-    return Chroma.from_documents(
-        docs,
-        embedding=get_embedding_model(),
-        persist_directory=str(persist_dir),
-    )
+    db = _chroma_handle(str(persist_dir.resolve()))
+    
+    if not isinstance(docs, ChunkBatch):
+        docs = list(docs)
+    if len(docs):
+        _run_sync(aadd_documents(
+            db, docs, batch_size=batch_size, concurrency=concurrency
+        ))
+    return db
 
-def load_chroma(persist_dir: str | Path = "./chroma_db") -> Chroma:
+def _enable_wal(persist_dir: str) -> None:
+    """Switch the store's SQLite file to write-ahead logging.
+
+    journal_mode is persisted in the database file, so setting it once
+    before Chroma opens the store makes bulk inserts append to the log
+    instead of rewriting the rollback journal on every commit.
+    """
+    Path(persist_dir).mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(Path(persist_dir) / "chroma.sqlite3"))
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.OperationalError as e:
+        # Another process holds the file; it keeps its current journal mode
+        print(f"Could not enable WAL for {persist_dir}: {e}")
+    finally:
+        conn.close()
+
+@lru_cache(maxsize=8)
+def _chroma_handle(persist_dir: str) -> Chroma:
+    """Open a Chroma store once per resolved directory and reuse the handle."""
+    _enable_wal(persist_dir)
     return Chroma(
         embedding_function=get_embedding_model(),
-        persist_directory=str(persist_dir),
+        persist_directory=persist_dir,
     )
 
+def load_chroma(persist_dir: str | Path = "./chroma_db") -> Chroma:
+    return _chroma_handle(str(Path(persist_dir).resolve()))
+
 if __name__ == "__main__":
     # Example usage of the RAG pipeline
     print("Starting RAG demonstration...")
@@ -1,3 +1,5 @@
 from .routes import router
+from airz.rate_limit import TokenBucket
+from .store import VectorStore
 
-__all__ = ["router"] 
\ No newline at end of file
+__all__ = ["router", "TokenBucket", "VectorStore"]
\ No newline at end of file
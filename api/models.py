@@ -1,5 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import Annotated, List, Optional, Dict
+
+# Longest query accepted before it reaches the embedding model
+MAX_QUERY_LENGTH = 8192
+
+# Most queries accepted in one batch search request
+MAX_BATCH_QUERIES = 32
+
+QueryText = Annotated[str, Field(min_length=1, max_length=MAX_QUERY_LENGTH)]
 
 class Document(BaseModel):
     """A document with its content and metadata."""
@@ -8,7 +16,7 @@ class Document(BaseModel):
 
 class SearchQuery(BaseModel):
     """Search query parameters."""
-    query: str
+    query: QueryText
     k: int = Field(default=4, gt=0, description="Number of results to return")
     threshold: Optional[float] = Field(
         default=None,
@@ -17,11 +25,34 @@ class SearchQuery(BaseModel):
         description="Similarity threshold"
     )
 
+class BatchSearchQuery(BaseModel):
+    """Batch search query parameters."""
+    queries: List[QueryText] = Field(
+        min_length=1,
+        max_length=MAX_BATCH_QUERIES,
+        description="Queries to search for"
+    )
+    k: int = Field(default=4, gt=0, description="Number of results per query")
+    threshold: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Similarity threshold"
+    )
+
 class SearchResponse(BaseModel):
     """Search results response."""
     query: str
     results: List[Document]
 
+class BatchSearchItem(SearchResponse):
+    """One streamed batch search result, tagged with its query's position."""
+    index: int
+
+class BatchSearchResponse(BaseModel):
+    """Batch search results, one response per query in input order."""
+    results: List[SearchResponse]
+
 class AddDocumentResponse(BaseModel):
     """Response after adding a document."""
     message: str
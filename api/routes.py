@@ -1,18 +1,54 @@
-from fastapi import APIRouter, UploadFile, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from airz.rate_limit import TokenBucket
 from .store import VectorStore
-from .models import SearchQuery, SearchResponse, AddDocumentResponse, StoreStats
+from .models import (
+    SearchQuery, SearchResponse, BatchSearchQuery, BatchSearchResponse,
+    AddDocumentResponse, StoreStats
+)
 
 # Create router
 router = APIRouter(prefix="/api")
 
-# Initialize vector store
-store = VectorStore()
+def get_store(request: Request) -> VectorStore:
+    """Get the shared vector store created at app startup."""
+    return request.app.state.store
+
+def _check_rate(request: Request, searches: int) -> None:
+    """Reject the request with 429 if it would exceed the search rate limit.
+    
+    Requests for more searches than the bucket can ever hold get a 422,
+    since no amount of waiting would let them through.
+    """
+    limiter: TokenBucket = request.app.state.search_limiter
+    if searches > limiter.capacity:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch of {searches} queries exceeds the limit of "
+                   f"{int(limiter.capacity)} searches per minute",
+        )
+    if not limiter.try_acquire(searches):
+        raise HTTPException(
+            status_code=429,
+            detail="Search rate limit exceeded",
+            headers={"Retry-After": str(int(limiter.retry_after(searches)) + 1)},
+        )
+
+def limit_search(request: Request, query: SearchQuery = Depends()) -> SearchQuery:
+    """Count a single search against the rate limit, once the query is valid.
+    
+    FastAPI skips this when SearchQuery fails validation, so invalid
+    requests don't use up tokens.
+    """
+    _check_rate(request, 1)
+    return query
 
 @router.post("/documents", response_model=AddDocumentResponse)
 async def add_document(
     file: UploadFile,
-    chunk_size: int = 300,
-    chunk_overlap: int = 20
+    chunk_size: int = Query(default=300, gt=0),
+    chunk_overlap: int = Query(default=20, ge=0),
+    store: VectorStore = Depends(get_store)
 ):
     """Add a document to the vector store."""
     try:
@@ -21,11 +57,16 @@ async def add_document(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/search", response_model=SearchResponse)
-async def search_documents(query: SearchQuery = Depends()):
+async def search_documents(
+    query: SearchQuery = Depends(limit_search),
+    store: VectorStore = Depends(get_store)
+):
     """Search for similar documents."""
     try:
         return store.search(
@@ -36,8 +77,53 @@ async def search_documents(query: SearchQuery = Depends()):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_documents_batch(
+    query: BatchSearchQuery,
+    request: Request,
+    store: VectorStore = Depends(get_store)
+):
+    """Search for similar documents for several queries at once."""
+    # Every query in the batch counts against the rate limit
+    _check_rate(request, len(query.queries))
+    try:
+        return await store.search_batch(
+            queries=query.queries,
+            k=query.k,
+            threshold=query.threshold
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/search/batch/stream")
+async def search_documents_batch_stream(
+    query: BatchSearchQuery,
+    request: Request,
+    store: VectorStore = Depends(get_store)
+):
+    """Stream batch search results as NDJSON, one line per query as it completes.
+    
+    Each line is a SearchResponse with the index of its query, so clients
+    can use fast results without waiting for the slowest query.
+    """
+    _check_rate(request, len(query.queries))
+    try:
+        results = await store.search_batch_stream(
+            queries=query.queries,
+            k=query.k,
+            threshold=query.threshold
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def ndjson():
+        async for item in results:
+            yield item.model_dump_json() + "\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
 @router.get("/status", response_model=StoreStats)
-async def get_status():
+async def get_status(store: VectorStore = Depends(get_store)):
     """Get vector store status."""
     try:
         return store.get_stats()
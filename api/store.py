@@ -1,10 +1,25 @@
+import asyncio
+import tempfile
 from pathlib import Path
-from typing import List
+from typing import AsyncIterator, List
+import aiofiles
+import numpy as np
 from fastapi import UploadFile
-from airz.vector_store import build_chroma, load_chroma
+from langchain.schema import Document as LCDocument
+from airz.embeddings import get_embedding_model
+from airz.vector_store import aadd_documents, build_chroma, load_chroma
 from airz.loaders import load_any, split_docs
 from airz.retrieval import get_retriever
-from .models import Document, SearchResponse, StoreStats, AddDocumentResponse
+from .models import (
+    Document, SearchResponse, BatchSearchItem, BatchSearchResponse, StoreStats,
+    AddDocumentResponse
+)
+
+# Size of each read when streaming an upload to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Largest upload accepted, checked while streaming
+MAX_UPLOAD_BYTES = 50 << 20
 
 class VectorStore:
     def __init__(self, db_path: str = "./vector_store_db"):
@@ -41,19 +56,38 @@ class VectorStore:
             
         Returns:
             AddDocumentResponse with chunk count and message
+            
+        Raises:
+            ValueError: If the upload is empty, larger than MAX_UPLOAD_BYTES,
+                or contains no text
         """
-        # Save uploaded file temporarily
-        temp_path = Path("temp_upload")
+        # Save uploaded file temporarily, keeping its suffix so load_any
+        # picks the right loader and concurrent uploads don't collide
+        suffix = Path(file.filename or "").suffix
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+            temp_path = Path(temp_file.name)
         try:
-            content = await file.read()
-            temp_path.write_bytes(content)
+            # Stream the upload in fixed-size chunks instead of buffering it all
+            size = 0
+            async with aiofiles.open(temp_path, "wb") as out:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > MAX_UPLOAD_BYTES:
+                        raise ValueError(
+                            f"{file.filename} exceeds the {MAX_UPLOAD_BYTES >> 20} MiB upload limit"
+                        )
+                    await out.write(chunk)
+            if size == 0:
+                raise ValueError(f"{file.filename} is empty")
             
             # Load and chunk document
             docs = load_any(temp_path)
-            chunks = split_docs(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+            chunks = split_docs(docs, chunk_size=chunk_size, overlap=chunk_overlap)
+            if not chunks:
+                raise ValueError(f"No text found in {file.filename}")
             
-            # Add to vector store
-            self.db.add_documents(chunks)
+            # Embed batches concurrently and add to vector store
+            await aadd_documents(self.db, chunks)
             
             return AddDocumentResponse(
                 message=f"Added {len(chunks)} chunks from {file.filename}",
@@ -78,13 +112,115 @@ class VectorStore:
         """
         retriever = get_retriever(self.db, k=k, threshold=threshold)
         results = retriever.invoke(query)
+        return self._to_response(query, results)
+    
+    async def search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        threshold: float | None = None
+    ) -> BatchSearchResponse:
+        """Search for similar documents for several queries at once.
+        
+        All queries are embedded in a single request and looked up in a
+        single query against Chroma's native HNSW index.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            threshold: Optional similarity threshold
+            
+        Returns:
+            BatchSearchResponse with one SearchResponse per query, in input order
+        """
+        vectors = await asyncio.to_thread(get_embedding_model().embed_queries, queries)
+        results = await asyncio.to_thread(self._search_by_vectors, vectors, k, threshold)
+        return BatchSearchResponse(results=[
+            self._to_response(query, docs)
+            for query, docs in zip(queries, results)
+        ])
+    
+    async def search_batch_stream(
+        self,
+        queries: List[str],
+        k: int = 4,
+        threshold: float | None = None
+    ) -> AsyncIterator[BatchSearchItem]:
+        """Search for several queries, yielding each result as soon as it is ready.
+        
+        Queries are embedded together up front, so embedding errors are
+        raised here rather than mid-stream. Each query is then looked up
+        in its own task and results are yielded in completion order,
+        tagged with the index of their query.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            threshold: Optional similarity threshold
+            
+        Returns:
+            Async iterator of BatchSearchItem, in completion order
+        """
+        vectors = await asyncio.to_thread(get_embedding_model().embed_queries, queries)
+        
+        async def lookup(i: int) -> tuple[int, List[LCDocument]]:
+            docs = await asyncio.to_thread(
+                self._search_by_vectors, vectors[i:i + 1], k, threshold
+            )
+            return i, docs[0]
+        
+        async def results() -> AsyncIterator[BatchSearchItem]:
+            tasks = [asyncio.create_task(lookup(i)) for i in range(len(queries))]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    i, docs = await next_done
+                    response = self._to_response(queries[i], docs)
+                    yield BatchSearchItem(index=i, **response.model_dump())
+            finally:
+                # Stop outstanding lookups if the client goes away
+                for task in tasks:
+                    task.cancel()
         
+        return results()
+    
+    def _search_by_vectors(
+        self,
+        vectors: np.ndarray,
+        k: int,
+        threshold: float | None
+    ) -> List[List[LCDocument]]:
+        """Look up documents for already embedded queries in one Chroma call.
+        
+        Returns:
+            One list of documents per vector, in input order
+        """
+        results = self.db._collection.query(
+            query_embeddings=vectors,
+            n_results=k,
+            include=["documents", "metadatas", "distances"],
+        )
+        relevance = self.db._select_relevance_score_fn()
+        
+        docs_per_query = []
+        for ids, texts, metadatas, distances in zip(
+            results["ids"], results["documents"], results["metadatas"], results["distances"]
+        ):
+            docs_per_query.append([
+                LCDocument(id=doc_id, page_content=text, metadata=metadata or {})
+                for doc_id, text, metadata, distance in zip(ids, texts, metadatas, distances)
+                if threshold is None or relevance(distance) >= threshold
+            ])
+        return docs_per_query
+    
+    @staticmethod
+    def _to_response(query: str, docs: List[LCDocument]) -> SearchResponse:
+        """Convert LangChain documents into a SearchResponse."""
         documents = [
             Document(
                 content=doc.page_content,
                 metadata=doc.metadata
             )
-            for doc in results
+            for doc in docs
         ]
         
         return SearchResponse(
@@ -1,8 +1,27 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from api import router
+from fastapi.responses import ORJSONResponse
+from api import router, TokenBucket, VectorStore
+from airz.embeddings import get_embedding_model
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the embedding model and vector store once, before serving requests."""
+    get_embedding_model()
+    app.state.store = VectorStore()
+    app.state.store.db
+    app.state.search_limiter = TokenBucket(
+        int(os.getenv("MAX_SEARCHES_PER_MINUTE", "60")), per=60.0
+    )
+    yield
 
 # Initialize FastAPI app
-app = FastAPI(title="Vector Store API")
+app = FastAPI(
+    title="Vector Store API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Include API routes
 app.include_router(router)
@@ -10,4 +29,4 @@ app.include_router(router)
 # For development
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
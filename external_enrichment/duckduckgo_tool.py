@@ -1,6 +1,82 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from langchain_community.tools import DuckDuckGoSearchResults
 from typing import Dict
+from airz.rate_limit import TokenBucket
+
+# Maximum DuckDuckGo requests in flight at once, to avoid rate limiting
+MAX_CONCURRENT_SEARCHES = 2
+
+# Maximum DuckDuckGo requests started per minute, across all threads
+SEARCHES_PER_MINUTE = int(os.getenv("DDG_SEARCHES_PER_MINUTE", "30"))
+
+# How long search results are reused before DuckDuckGo is queried again
+CACHE_TTL_SECONDS = 6 * 3600
+
+# On-disk cache of search results, shared across runs
+CACHE_PATH = os.getenv("ENRICHMENT_CACHE_PATH", ".enrichment_cache.sqlite")
+
+_search_slots = threading.Semaphore(MAX_CONCURRENT_SEARCHES)
+_search_rate = TokenBucket(SEARCHES_PER_MINUTE, per=60.0)
+
+_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _get_search() -> DuckDuckGoSearchResults:
+    """Create the search tool on first use and share it across calls."""
+    return DuckDuckGoSearchResults()
+
+@lru_cache(maxsize=1)
+def _get_cache() -> sqlite3.Connection:
+    """Open the result cache on first use, dropping expired entries."""
+    conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS search_results "
+        "(key TEXT PRIMARY KEY, fetched_at REAL, results TEXT)"
+    )
+    conn.execute(
+        "DELETE FROM search_results WHERE fetched_at < ?",
+        (time.time() - CACHE_TTL_SECONDS,),
+    )
+    conn.commit()
+    return conn
+
+def _cache_key(query: str) -> str:
+    """Hash a query so case, punctuation and word order don't matter."""
+    words = sorted(re.findall(r"\w+", query.lower()))
+    return hashlib.sha1(" ".join(words).encode()).hexdigest()
+
+def _run_search(query: str) -> str:
+    """Run a single search, serving it from the cache while it is fresh."""
+    key = _cache_key(query)
+    with _cache_lock:
+        row = _get_cache().execute(
+            "SELECT results FROM search_results WHERE key = ? AND fetched_at >= ?",
+            (key, time.time() - CACHE_TTL_SECONDS),
+        ).fetchone()
+    if row is not None:
+        print(f"Using cached results for: {query}")
+        return row[0]
+
+    _search_rate.acquire()
+    with _search_slots:
+        print(f"Searching for: {query}")
+        results = _get_search().run(query)
+
+    with _cache_lock:
+        conn = _get_cache()
+        conn.execute(
+            "INSERT OR REPLACE INTO search_results (key, fetched_at, results) VALUES (?, ?, ?)",
+            (key, time.time(), results),
+        )
+        conn.commit()
+    return results
 
 def get_zone_enrichment_data(zone_name: str) -> Dict[str, str]:
     """
@@ -8,7 +84,10 @@ def get_zone_enrichment_data(zone_name: str) -> Dict[str, str]:
 
     This function performs targeted searches for different enrichment signals
     (crime rate, cleanliness, public perception, investment potential) and
-    returns the raw search result snippets for each category.
+    returns the raw search result snippets for each category. The searches
+    run concurrently, with at most MAX_CONCURRENT_SEARCHES in flight and
+    SEARCHES_PER_MINUTE started per minute, and results are reused for
+    CACHE_TTL_SECONDS.
 
     This raw data can then be passed to a downstream LLM (like in the LLM Manager)
     to be summarized into the final structured format.
@@ -20,8 +99,6 @@ def get_zone_enrichment_data(zone_name: str) -> Dict[str, str]:
         A dictionary where keys are enrichment categories and values are the
         raw string of search result snippets.
     """
-    search = DuckDuckGoSearchResults()
-    
     enrichment_signals = {
         "crime_rate": f"crime rate statistics {zone_name}",
         "cleanliness": f"cleanliness and sanitation {zone_name}",
@@ -29,13 +106,15 @@ def get_zone_enrichment_data(zone_name: str) -> Dict[str, str]:
         "investment_potential": f"real estate investment potential {zone_name}",
     }
 
-    enriched_data: Dict[str, str] = {}
-    
     print(f"--- Fetching enrichment data for: {zone_name} ---")
-    for signal, query in enrichment_signals.items():
-        print(f"Searching for: {query}")
-        results = search.run(query)
-        enriched_data[signal] = results
-        time.sleep(1) # Add a 1-second delay to avoid rate limiting
+    with ThreadPoolExecutor(max_workers=len(enrichment_signals)) as executor:
+        futures = {
+            signal: executor.submit(_run_search, query)
+            for signal, query in enrichment_signals.items()
+        }
+        # Collect in signal order so the result keys keep a stable order
+        enriched_data: Dict[str, str] = {
+            signal: future.result() for signal, future in futures.items()
+        }
 
-    return enriched_data 
\ No newline at end of file
+    return enriched_data
@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
-from airz.loaders import load_any, split_docs
+from langchain.schema import Document
+from airz.loaders import fast_recursive_split, load_any, split_docs
 
 @pytest.fixture
 def retrieval_doc():
@@ -15,8 +16,63 @@ def test_basic_chunking(retrieval_doc):
     assert all(len(chunk.page_content) <= 400 for chunk in chunks)  # Allow some flexibility in chunk size
 
 
+@pytest.mark.parametrize("chunk_size, overlap", [(300, 20), (100, 40), (120, 20), (50, 0)])
+def test_chunk_size_is_upper_bound(retrieval_doc, chunk_size, overlap):
+    """Test that no chunk, overlap included, is longer than chunk_size."""
+    chunks = split_docs(retrieval_doc, chunk_size=chunk_size, overlap=overlap)
+    assert max(len(chunk) for chunk in chunks.texts) <= chunk_size
+
+def test_unbroken_text_packs_full_chunks():
+    """Test that text without separators is cut into full-size chunks."""
+    chunks = split_docs([Document(page_content="x" * 1000)], chunk_size=100, overlap=0)
+    assert len(chunks) == 10
+    assert "".join(chunks.texts) == "x" * 1000
+
 def test_small_document_single_chunk(retrieval_doc):
     """Test that very large chunk size results in single chunk."""
     chunks = split_docs(retrieval_doc, chunk_size=10000, overlap=20)
     assert len(chunks) == 1  # Should be a single chunk
-    assert chunks[0].page_content == retrieval_doc[0].page_content  # Content should be unchanged 
\ No newline at end of file
+    assert chunks[0].page_content == retrieval_doc[0].page_content  # Content should be unchanged 
+
+def test_chunks_are_slices_of_source(retrieval_doc):
+    """Test that chunks are exact slices of the source text, including non-ASCII text."""
+    text = retrieval_doc[0].page_content + "\n\nMalasaña, Chamberí y Lavapiés — barrios de Madrid."
+    docs = [Document(page_content=text, metadata={"source": "mixed.txt"})]
+    chunks = split_docs(docs, chunk_size=120, overlap=20)
+    assert len(chunks) > 1
+    assert all(chunk.page_content in text for chunk in chunks)
+    assert all(chunk.metadata == {"source": "mixed.txt"} for chunk in chunks)
+    assert "Lavapiés — barrios de Madrid." in chunks[-1].page_content
+
+def test_chunk_offsets_index_source(retrieval_doc):
+    """Test that chunk offsets slice each chunk back out of its source text."""
+    chunks = split_docs(retrieval_doc, chunk_size=300, overlap=20)
+    text = retrieval_doc[0].page_content
+    assert chunks.offsets.shape == (len(chunks), 2)
+    assert all(text[start:end] == chunk for (start, end), chunk in zip(chunks.offsets, chunks.texts))
+    assert chunks.chunk_metadatas()[0] is chunks.metadatas[0]
+
+def test_fast_recursive_split_token_budget(retrieval_doc):
+    """Test that token-budgeted chunks, overlap included, respect the target."""
+    text = retrieval_doc[0].page_content
+    chunks = fast_recursive_split(text, target_tokens=50, overlap=5)
+    assert len(chunks) > 1
+    assert all(len(chunk.split()) <= 50 for chunk in chunks)
+    assert all(chunk in text for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        shared = min(5, len(previous.split()))
+        assert chunk.split()[:shared] == previous.split()[-shared:]
+
+def test_fast_recursive_split_keeps_tab_separated_tokens():
+    """Test that tabs are word boundaries, so tokens are never cut."""
+    chunks = fast_recursive_split("a\tb\t" * 500, target_tokens=50, overlap=5)
+    assert len(chunks) > 1
+    assert all(set(chunk.split()) <= {"a", "b"} for chunk in chunks)
+
+@pytest.mark.parametrize("chunk_size, overlap", [(0, 0), (-5, 0), (300, -1), (5, 20), (20, 20)])
+def test_invalid_chunk_sizes_rejected(retrieval_doc, chunk_size, overlap):
+    """Test that sizes the splitter cannot honour raise instead of hanging."""
+    with pytest.raises(ValueError):
+        split_docs(retrieval_doc, chunk_size=chunk_size, overlap=overlap)
+    with pytest.raises(ValueError):
+        fast_recursive_split(retrieval_doc[0].page_content, target_tokens=chunk_size, overlap=overlap)
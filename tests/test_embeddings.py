@@ -1,7 +1,9 @@
 import pytest
 import numpy as np
 from pathlib import Path
-from airz.embeddings import get_embedding_model
+from airz.embeddings import (
+    CachedEmbeddings, dequantize, embed_with_bisect, get_embedding_model, quantize
+)
 from airz.loaders import load_any, split_docs
 
 def cosine_similarity(v1, v2):
@@ -11,6 +13,112 @@ def cosine_similarity(v1, v2):
     norm2 = np.linalg.norm(v2)
     return dot_product / (norm1 * norm2)
 
+class CountingEmbeddings:
+    """Fake embedding model that records which texts it was asked to embed."""
+    model = "fake"
+    
+    def __init__(self):
+        self.calls = []
+    
+    def embed_documents(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+    
+    def embed_query(self, text, **kwargs):
+        return [float(len(text)), 1.0]
+
+def test_cached_embeddings_skip_repeated_texts(tmp_path):
+    """Test that cached texts are not sent to the upstream model again."""
+    upstream = CountingEmbeddings()
+    cache = CachedEmbeddings(upstream, cache_path=tmp_path / "cache.sqlite")
+    
+    first = cache.embed_documents(["alpha", "beta", "alpha"])
+    second = cache.embed_documents(["beta", "gamma"])
+    
+    assert np.allclose(first, [[5.0, 1.0], [4.0, 1.0], [5.0, 1.0]], atol=0.05)
+    assert np.allclose(second, [[4.0, 1.0], [5.0, 1.0]], atol=0.05)
+    assert first[1] == second[0]  # cache hits return the same vectors as misses
+    assert upstream.calls == [["alpha", "beta"], ["gamma"]]
+    
+    # A fresh wrapper over the same file reuses the persisted vectors
+    reopened = CachedEmbeddings(upstream, cache_path=tmp_path / "cache.sqlite")
+    reopened.embed_documents(["alpha", "gamma"])
+    assert len(upstream.calls) == 2
+
+def test_embed_queries_bypass_cache(tmp_path):
+    """Test that query embeddings are neither cached nor quantized."""
+    upstream = CountingEmbeddings()
+    cache = CachedEmbeddings(upstream, cache_path=tmp_path / "cache.sqlite")
+    
+    first = cache.embed_queries(["what is a retriever?"])
+    second = cache.embed_queries(["what is a retriever?"])
+    
+    assert first.tolist() == second.tolist() == [[20.0, 1.0]]
+    assert len(upstream.calls) == 2
+    count = cache._conn.execute("SELECT COUNT(*) FROM embeddings_int8").fetchone()[0]
+    assert count == 0
+
+class FlakyEmbeddings(CountingEmbeddings):
+    """Fake embedding model that fails any batch containing a poisoned text once."""
+    
+    def __init__(self, poisoned):
+        super().__init__()
+        self.poisoned = set(poisoned)
+    
+    def embed_documents(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        failing = self.poisoned & set(texts)
+        if failing:
+            if len(texts) == 1:
+                self.poisoned -= failing
+            raise ConnectionError("upstream error")
+        return [[float(len(t)), 1.0] for t in texts]
+
+def test_embed_with_bisect_retries_only_failing_halves():
+    """Test that a failed batch is bisected and only the failing text is retried."""
+    upstream = FlakyEmbeddings(poisoned=["ccc"])
+    texts = ["a", "bb", "ccc", "dddd"]
+    
+    vectors = embed_with_bisect(upstream, texts)
+    
+    assert vectors == [[float(len(t)), 1.0] for t in texts]
+    assert upstream.calls == [
+        ["a", "bb", "ccc", "dddd"],
+        ["a", "bb"],
+        ["ccc", "dddd"],
+        ["ccc"],
+        ["ccc"],
+        ["dddd"],
+    ]
+
+class RejectingEmbeddings(CountingEmbeddings):
+    """Fake embedding model that rejects every request, like a bad API key."""
+    
+    def embed_documents(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        raise ValueError("API key not valid")
+
+def test_embed_with_bisect_raises_permanent_errors_at_once():
+    """Test that non-transient errors are neither bisected nor retried."""
+    upstream = RejectingEmbeddings()
+    
+    with pytest.raises(ValueError):
+        embed_with_bisect(upstream, ["a", "bb", "ccc", "dddd"])
+    with pytest.raises(ValueError):
+        embed_with_bisect(upstream, ["a"])
+    
+    assert upstream.calls == [["a", "bb", "ccc", "dddd"], ["a"]]
+
+def test_quantize_round_trip():
+    """Test that int8 quantization keeps vectors close to the originals."""
+    rng = np.random.default_rng(0)
+    vector = rng.normal(size=768).astype(np.float32)
+    blob = quantize(vector)
+    restored = dequantize(blob)
+    
+    assert len(blob) == 4 + 768  # scale + one byte per component
+    assert cosine_similarity(vector, restored) > 0.999
+
 def test_embedding_model():
     """Test that the embedding model works correctly."""
     model = get_embedding_model()
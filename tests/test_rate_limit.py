@@ -0,0 +1,29 @@
+import threading
+import time
+import pytest
+from airz.rate_limit import TokenBucket
+
+def test_try_acquire_stops_at_capacity():
+    """Test that a full bucket serves a burst up to its capacity, then refuses."""
+    bucket = TokenBucket(3, per=60.0)
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    assert bucket.retry_after() > 0
+
+def test_acquire_waits_in_parallel():
+    """Test that concurrent callers over the limit each wait only for their own token."""
+    bucket = TokenBucket(2, per=1.0)
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Two tokens are available at once; the other two refill within a second
+    assert time.monotonic() - start < 1.5
+
+@pytest.mark.parametrize("rate, per", [(0, 60.0), (-1, 60.0), (5, 0)])
+def test_invalid_rates_rejected(rate, per):
+    """Test that rates that would never refill are rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate, per=per)
@@ -0,0 +1,83 @@
+import numpy as np
+from langchain.schema import Document
+from airz.loaders import split_docs
+from airz.vector_store import add_embedded_documents
+
+class StubCollection:
+    """Fake Chroma collection that records upserts."""
+
+    def __init__(self):
+        self.upserts = []
+
+    def upsert(self, ids, embeddings, documents, metadatas=None):
+        self.upserts.append({
+            "ids": ids,
+            "embeddings": embeddings,
+            "documents": documents,
+            "metadatas": metadatas,
+        })
+
+class StubClient:
+    """Fake Chroma client with a configurable maximum batch size."""
+
+    def __init__(self, max_batch_size):
+        self.max_batch_size = max_batch_size
+
+    def get_max_batch_size(self):
+        return self.max_batch_size
+
+class StubStore:
+    """Fake Chroma store exposing only the underlying client and collection."""
+
+    def __init__(self, max_batch_size=5461):
+        self._client = StubClient(max_batch_size)
+        self._collection = StubCollection()
+
+def test_add_embedded_documents_from_chunk_batch():
+    """Test that a ChunkBatch is upserted column-wise with its vectors."""
+    docs = [
+        Document(page_content="alpha beta gamma delta", metadata={"source": "a.txt"}),
+        Document(page_content="epsilon zeta", metadata={}),
+    ]
+    chunks = split_docs(docs, chunk_size=12, overlap=0)
+    vectors = np.arange(len(chunks) * 2, dtype=np.float32).reshape(-1, 2)
+    db = StubStore()
+
+    ids = add_embedded_documents(db, chunks, vectors)
+
+    assert len(ids) == len(chunks)
+    with_metadata, without_metadata = db._collection.upserts
+    assert with_metadata["documents"] == list(chunks.texts[:-1])
+    assert with_metadata["metadatas"] == [{"source": "a.txt"}] * (len(chunks) - 1)
+    assert np.array_equal(with_metadata["embeddings"], vectors[:-1])
+    assert without_metadata["documents"] == ["epsilon zeta"]
+    assert without_metadata["metadatas"] is None
+    assert without_metadata["ids"] == [ids[-1]]
+
+def test_add_embedded_documents_keeps_document_ids():
+    """Test that plain Documents keep their own IDs."""
+    docs = [Document(id="doc-1", page_content="hello", metadata={"source": "b.txt"})]
+    db = StubStore()
+
+    ids = add_embedded_documents(db, docs, np.ones((1, 2), dtype=np.float32))
+
+    assert ids == ["doc-1"]
+    assert db._collection.upserts[0]["documents"] == ["hello"]
+
+def test_add_embedded_documents_respects_max_batch_size():
+    """Test that upserts are split to fit Chroma's maximum batch size."""
+    docs = [
+        Document(page_content=f"text {i}", metadata={"source": "c.txt"})
+        for i in range(5)
+    ]
+    vectors = np.arange(10, dtype=np.float32).reshape(5, 2)
+    db = StubStore(max_batch_size=2)
+
+    ids = add_embedded_documents(db, docs, vectors)
+
+    assert [len(upsert["ids"]) for upsert in db._collection.upserts] == [2, 2, 1]
+    assert [i for upsert in db._collection.upserts for i in upsert["ids"]] == ids
+    assert np.array_equal(
+        np.concatenate([upsert["embeddings"] for upsert in db._collection.upserts]),
+        vectors,
+    )